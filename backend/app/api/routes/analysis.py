@@ -1,12 +1,20 @@
 """Analysis endpoints."""
 
 import asyncio
+import hashlib
 import secrets
-from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator
 
-from fastapi import APIRouter, HTTPException, Request
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
+from app.api.websocket.handlers import (
+    TERMINAL_EVENT_TYPES,
+    get_analysis_snapshot,
+    is_final_event,
+    schedule_analysis,
+)
 from app.config import settings
 from app.rate_limiter import limiter
 from app.models.requests import AnalysisRequest
@@ -18,11 +26,16 @@ from app.models.responses import (
     ErrorResponse,
 )
 from app.services.file_manager import file_manager
+from app.services.job_store import AnalysisJob, job_store
+from app.utils.http import etag_matches
 
 router = APIRouter()
 
-# In-memory storage for analysis jobs (use Redis in production)
-analysis_jobs: dict[str, dict] = {}
+
+def status_etag(job: dict) -> str:
+    """Compute an ETag for the pollable status fields of a job."""
+    key = f"{job['status'].value}|{job['progress']}|{job['current_step']}|{job['error']}"
+    return f'"{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}"'
 
 
 @router.post(
@@ -35,9 +48,10 @@ async def start_analysis(request: Request, analysis_request: AnalysisRequest):
     """
     Start compliance analysis on uploaded documents.
 
-    The analysis runs asynchronously. Use the WebSocket endpoint
-    /ws/analysis/{session_id} to receive real-time progress updates,
-    or poll /analysis/{analysis_id}/status for status.
+    The analysis starts immediately in the background. Subscribe to
+    /analysis/{analysis_id}/events (SSE) or the WebSocket endpoint
+    /ws/analysis/{session_id} to receive real-time progress updates.
+    Polling /analysis/{analysis_id}/status is also supported.
     """
     # Validate session has files
     files = await file_manager.get_session_files(analysis_request.session_id)
@@ -51,29 +65,27 @@ async def start_analysis(request: Request, analysis_request: AnalysisRequest):
     analysis_id = secrets.token_urlsafe(16)
 
     # Store job info
-    analysis_jobs[analysis_id] = {
-        "session_id": analysis_request.session_id,
-        "frameworks": analysis_request.frameworks,
-        "vendor_name": analysis_request.vendor_name,
-        "reviewed_by": analysis_request.reviewed_by,
-        "ticket_number": analysis_request.ticket_number,
-        "status": AnalysisStatus.PENDING,
-        "progress": 0,
-        "current_step": None,
-        "results": None,
-        "error": None,
-        "started_at": datetime.utcnow(),
-        "completed_at": None,
-    }
-
-    # Analysis will be started by WebSocket handler when client connects
-    # This allows real-time streaming of progress
+    await job_store.create_job(analysis_id, AnalysisJob(
+        session_id=analysis_request.session_id,
+        frameworks=analysis_request.frameworks,
+        vendor_name=analysis_request.vendor_name,
+        reviewed_by=analysis_request.reviewed_by,
+        ticket_number=analysis_request.ticket_number,
+    ))
+
+    # Run independently of any client connection; clients follow progress
+    # over SSE or the WebSocket, or poll status, instead
+    schedule_analysis(analysis_request.session_id, analysis_id)
 
     return AnalysisStartResponse(
         analysis_id=analysis_id,
         session_id=analysis_request.session_id,
         status=AnalysisStatus.PENDING,
-        message=f"Analysis queued. Connect to WebSocket /ws/analysis/{analysis_request.session_id} to start and receive progress updates.",
+        message=(
+            f"Analysis started. Follow progress at /analysis/{analysis_id}/events "
+            f"(SSE) or WebSocket /ws/analysis/{analysis_request.session_id}, "
+            f"or poll /analysis/{analysis_id}/status."
+        ),
     )
 
 
@@ -81,12 +93,24 @@ async def start_analysis(request: Request, analysis_request: AnalysisRequest):
     "/analysis/{analysis_id}/status",
     response_model=AnalysisStatusResponse,
 )
-async def get_analysis_status(analysis_id: str):
-    """Get the current status of an analysis job."""
-    if analysis_id not in analysis_jobs:
+async def get_analysis_status(
+    analysis_id: str, request: Request, response: Response
+):
+    """
+    Get the current status of an analysis job.
+
+    Responses carry an ETag; pollers should send it back in If-None-Match
+    to get an empty 304 while the status is unchanged.
+    """
+    job = await job_store.get_job_status(analysis_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Analysis not found")
 
-    job = analysis_jobs[analysis_id]
+    etag = status_etag(job)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
     return AnalysisStatusResponse(
         analysis_id=analysis_id,
         status=job["status"],
@@ -96,36 +120,68 @@ async def get_analysis_status(analysis_id: str):
     )
 
 
+@router.get("/analysis/{analysis_id}/events")
+async def stream_analysis_events(analysis_id: str):
+    """
+    Stream analysis progress as Server-Sent Events.
+
+    Sends the current state first, then each progress event as it happens.
+    The stream ends once the analysis completes or fails.
+    """
+    if await job_store.get_job_status(analysis_id) is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+
+    async def event_stream() -> AsyncIterator[str]:
+        async with job_store.subscribe_events(analysis_id) as events:
+            snapshot = await get_analysis_snapshot(analysis_id)
+            if snapshot:
+                yield f"data: {snapshot.model_dump_json()}\n\n"
+                if snapshot.event_type in TERMINAL_EVENT_TYPES:
+                    return
+
+            async for payload in events:
+                yield f"data: {payload}\n\n"
+                if await is_final_event(
+                    analysis_id, orjson.loads(payload)["event_type"]
+                ):
+                    return
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get(
     "/analysis/{analysis_id}/results",
     response_model=AnalysisResultsResponse,
 )
 async def get_analysis_results(analysis_id: str):
     """Get the results of a completed analysis."""
-    if analysis_id not in analysis_jobs:
+    job = await job_store.get_job(analysis_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Analysis not found")
 
-    job = analysis_jobs[analysis_id]
-
-    if job["status"] == AnalysisStatus.PENDING:
+    if job.status == AnalysisStatus.PENDING:
         raise HTTPException(
             status_code=400,
             detail="Analysis has not started yet",
         )
 
-    if job["status"] == AnalysisStatus.PROCESSING:
+    if job.status == AnalysisStatus.PROCESSING:
         raise HTTPException(
             status_code=400,
             detail="Analysis is still in progress",
         )
 
-    if job["status"] == AnalysisStatus.FAILED:
+    if job.status == AnalysisStatus.FAILED:
         raise HTTPException(
             status_code=400,
-            detail=f"Analysis failed: {job['error']}",
+            detail=f"Analysis failed: {job.error}",
         )
 
-    results = job.get("results")
+    results = job.results
     if not results:
         raise HTTPException(
             status_code=500,
@@ -134,38 +190,11 @@ async def get_analysis_results(analysis_id: str):
 
     return AnalysisResultsResponse(
         analysis_id=analysis_id,
-        status=job["status"],
+        status=job.status,
         overall_compliance_score=results.get("overall_compliance_score", 0),
         frameworks=results.get("frameworks", []),
         findings=results.get("findings", []),
         risk_assessment=results.get("risk_assessment"),
         executive_summary=results.get("executive_summary"),
-        completed_at=job.get("completed_at"),
+        completed_at=job.completed_at,
     )
-
-
-def update_analysis_job(
-    analysis_id: str,
-    status: Optional[AnalysisStatus] = None,
-    progress: Optional[float] = None,
-    current_step: Optional[str] = None,
-    results: Optional[dict] = None,
-    error: Optional[str] = None,
-):
-    """Update analysis job status (called by analyzer service)."""
-    if analysis_id not in analysis_jobs:
-        return
-
-    job = analysis_jobs[analysis_id]
-    if status is not None:
-        job["status"] = status
-    if progress is not None:
-        job["progress"] = progress
-    if current_step is not None:
-        job["current_step"] = current_step
-    if results is not None:
-        job["results"] = results
-    if error is not None:
-        job["error"] = error
-    if status == AnalysisStatus.COMPLETED:
-        job["completed_at"] = datetime.utcnow()
@@ -1,25 +1,26 @@
 """Chat endpoints for AI assistant."""
 
+import asyncio
 import logging
 import re
-import secrets
-from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Request
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Request
 
-from app.api.routes.analysis import analysis_jobs
 from app.config import settings
 from app.rate_limiter import limiter
 from app.models.requests import ChatRequest
 from app.models.responses import ChatMessageResponse, ErrorResponse
+from app.services.bedrock import get_bedrock_client
+from app.services.job_store import job_store
+from app.utils.clock import utc_now
+from app.utils.ids import new_message_id
+from app.utils.validation import is_valid_session_id
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# In-memory chat history (use Redis in production)
-chat_histories: dict[str, list[dict]] = {}
-
 # Maximum message length
 MAX_MESSAGE_LENGTH = 4000
 
@@ -86,17 +87,13 @@ async def send_chat_message(request: Request, chat_request: ChatRequest):
     if not sanitized_message or len(sanitized_message) < 2:
         raise HTTPException(status_code=400, detail="Message too short or invalid")
 
-    # Initialize chat history for session if needed
-    if chat_request.session_id not in chat_histories:
-        chat_histories[chat_request.session_id] = []
-
     # Add user message to history (using sanitized version)
     user_message = {
         "role": "user",
         "content": sanitized_message,
-        "timestamp": datetime.utcnow(),
+        "timestamp": utc_now(),
     }
-    chat_histories[chat_request.session_id].append(user_message)
+    await job_store.append_chat_message(chat_request.session_id, user_message)
 
     try:
         # Build context from analysis results if available and requested
@@ -109,22 +106,24 @@ async def send_chat_message(request: Request, chat_request: ChatRequest):
             chat_request.session_id,
             sanitized_message,  # Use sanitized message
             context,
-            chat_histories[chat_request.session_id],
+            await job_store.get_chat_history(chat_request.session_id),
         )
 
         # Add assistant message to history
         assistant_message = {
             "role": "assistant",
             "content": response_content,
-            "timestamp": datetime.utcnow(),
+            "timestamp": utc_now(),
         }
-        chat_histories[chat_request.session_id].append(assistant_message)
+        await job_store.append_chat_message(
+            chat_request.session_id, assistant_message
+        )
 
         return ChatMessageResponse(
-            message_id=secrets.token_urlsafe(8),
+            message_id=new_message_id(),
             role="assistant",
             content=response_content,
-            timestamp=datetime.utcnow(),
+            timestamp=utc_now(),
         )
 
     except Exception as e:
@@ -137,41 +136,81 @@ async def send_chat_message(request: Request, chat_request: ChatRequest):
 
 
 async def build_analysis_context(session_id: str) -> str:
+    """Get the context string for a session's latest analysis results."""
+    analysis_id = await job_store.get_session_analysis_id(session_id)
+    if analysis_id is None:
+        return ""
+
+    # Rendered once per set of results; the store drops it if they change
+    context = await job_store.get_analysis_context(analysis_id)
+    if context is None:
+        results = await job_store.get_results(analysis_id)
+        if not results:
+            return ""
+        context = render_analysis_context(results)
+        await job_store.set_analysis_context(analysis_id, context)
+
+    return context
+
+
+def render_analysis_context(results: dict) -> str:
     """Build context string from analysis results."""
-    # Find analysis for this session
-    for analysis_id, job in analysis_jobs.items():
-        if job.get("session_id") == session_id and job.get("results"):
-            results = job["results"]
-            context_parts = [
-                "Analysis Results Summary:",
-                f"- Overall Compliance Score: {results.get('overall_compliance_score', 0):.1f}%",
-            ]
-
-            # Add framework coverage
-            for fw in results.get("frameworks", []):
-                context_parts.append(
-                    f"- {fw.get('framework')}: {fw.get('coverage_percentage', 0):.1f}% coverage"
-                )
-
-            # Add finding summary
-            findings = results.get("findings", [])
-            if findings:
-                severity_counts = {}
-                for f in findings:
-                    sev = f.get("severity", "unknown")
-                    severity_counts[sev] = severity_counts.get(sev, 0) + 1
-
-                context_parts.append(
-                    f"- Findings: {', '.join(f'{count} {sev}' for sev, count in severity_counts.items())}"
-                )
-
-            # Add executive summary if available
-            if results.get("executive_summary"):
-                context_parts.append(f"\nExecutive Summary:\n{results['executive_summary']}")
-
-            return "\n".join(context_parts)
-
-    return ""
+
+    context_parts = [
+        "Analysis Results Summary:",
+        f"- Overall Compliance Score: {results.get('overall_compliance_score', 0):.1f}%",
+    ]
+
+    # Add framework coverage
+    for fw in results.get("frameworks", []):
+        context_parts.append(
+            f"- {fw.get('framework')}: {fw.get('coverage_percentage', 0):.1f}% coverage"
+        )
+
+    # Add finding summary
+    findings = results.get("findings", [])
+    if findings:
+        severity_counts = {}
+        for f in findings:
+            sev = f.get("severity", "unknown")
+            severity_counts[sev] = severity_counts.get(sev, 0) + 1
+
+        context_parts.append(
+            f"- Findings: {', '.join(f'{count} {sev}' for sev, count in severity_counts.items())}"
+        )
+
+    # Add executive summary if available
+    if results.get("executive_summary"):
+        context_parts.append(f"\nExecutive Summary:\n{results['executive_summary']}")
+
+    return "\n".join(context_parts)
+
+
+def approximate_tokens(text: str) -> int:
+    """Cheaply estimate the token count of text (~4 characters per token)."""
+    return len(text) // 4
+
+
+def fit_to_budget(history: list[dict], max_input_tokens: int) -> list[dict]:
+    """
+    Return the most recent messages whose combined size fits the budget.
+
+    The latest message is always kept. The result starts with a user turn,
+    as Bedrock requires.
+    """
+    start = len(history)
+    used = 0
+    while start > 0:
+        cost = approximate_tokens(history[start - 1]["content"])
+        if used + cost > max_input_tokens and start < len(history):
+            break
+        used += cost
+        start -= 1
+
+    while start < len(history) - 1 and history[start]["role"] != "user":
+        start += 1
+
+    return history[start:]
 
 
 async def generate_chat_response(
@@ -181,22 +220,7 @@ async def generate_chat_response(
     history: list[dict],
 ) -> str:
     """Generate chat response using AWS Bedrock."""
-    import json
-
-    import boto3
-    from botocore.config import Config
-
-    config = Config(
-        connect_timeout=10,
-        read_timeout=settings.bedrock_timeout,
-        retries={"max_attempts": 2},
-    )
-
-    bedrock = boto3.client(
-        "bedrock-runtime",
-        region_name=settings.aws_region,
-        config=config,
-    )
+    bedrock = get_bedrock_client(settings.aws_region, settings.bedrock_timeout)
 
     # Build system prompt
     system_prompt = """You are a security compliance expert assistant helping users understand their vendor security analysis results.
@@ -213,9 +237,10 @@ Be concise, professional, and focus on practical guidance. If you don't have spe
     if context:
         system_prompt += f"\nCurrent Analysis Context:\n{context}"
 
-    # Build messages from history (last 10 messages for context)
+    # Build messages from as much recent history as fits the token budget
+    budget = settings.bedrock_max_input_tokens - approximate_tokens(system_prompt)
     messages = []
-    for msg in history[-10:]:
+    for msg in fit_to_budget(history, budget):
         messages.append({
             "role": msg["role"],
             "content": msg["content"],
@@ -229,24 +254,40 @@ Be concise, professional, and focus on practical guidance. If you don't have spe
         "messages": messages,
     }
 
-    response = bedrock.invoke_model(
-        modelId=settings.bedrock_model_id,
-        body=json.dumps(request_body),
-        contentType="application/json",
-        accept="application/json",
-    )
+    def invoke() -> dict:
+        response = bedrock.invoke_model(
+            modelId=settings.bedrock_model_id,
+            body=orjson.dumps(request_body),
+            contentType="application/json",
+            accept="application/json",
+        )
+        return orjson.loads(response["body"].read())
 
-    response_body = json.loads(response["body"].read())
+    # boto3 is blocking - run it off the event loop
+    response_body = await asyncio.to_thread(invoke)
     return response_body["content"][0]["text"]
 
 
 @router.get("/chat/{session_id}/history")
-async def get_chat_history(session_id: str, limit: int = 50):
-    """Get chat history for a session."""
-    if not all(c.isalnum() or c == "-" for c in session_id):
+async def get_chat_history(
+    session_id: str,
+    cursor: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+):
+    """
+    Get a page of chat history for a session, oldest message first.
+
+    Pass the returned next_cursor as cursor to fetch the following page;
+    it is null once the end of the history is reached. Cursors are message
+    sequence numbers, so pages stay aligned when old messages are trimmed.
+    """
+    if not is_valid_session_id(session_id):
         raise HTTPException(status_code=400, detail="Invalid session ID")
 
-    history = chat_histories.get(session_id, [])
+    # Fetch one extra message to detect whether another page exists
+    history = await job_store.get_chat_history(session_id, limit + 1, cursor)
+    has_more = len(history) > limit
+
     return {
         "session_id": session_id,
         "messages": [
@@ -255,18 +296,18 @@ async def get_chat_history(session_id: str, limit: int = 50):
                 "content": msg["content"],
                 "timestamp": msg["timestamp"].isoformat(),
             }
-            for msg in history[-limit:]
+            for msg in history[:limit]
         ],
+        "next_cursor": history[limit]["seq"] if has_more else None,
     }
 
 
 @router.delete("/chat/{session_id}/history")
 async def clear_chat_history(session_id: str):
     """Clear chat history for a session."""
-    if not all(c.isalnum() or c == "-" for c in session_id):
+    if not is_valid_session_id(session_id):
         raise HTTPException(status_code=400, detail="Invalid session ID")
 
-    if session_id in chat_histories:
-        del chat_histories[session_id]
+    await job_store.clear_chat_history(session_id)
 
     return {"success": True}
@@ -1,16 +1,26 @@
 """AWS Bedrock connection test endpoint."""
 
+import asyncio
 import time
 from typing import Optional
 
+import orjson
+from botocore.exceptions import ClientError, NoCredentialsError
 from fastapi import APIRouter, HTTPException
 
 from app.config import settings
 from app.models.requests import ConnectionTestRequest
 from app.models.responses import ConnectionTestResponse
+from app.services.bedrock import get_bedrock_client
+from app.utils.singleflight import SingleFlight
 
 router = APIRouter()
 
+# Concurrent tests of the same region/model share one Bedrock call, and
+# results are reused briefly (dashboards tend to poll this in bursts)
+CONNECTION_TEST_CACHE_SECONDS = 5
+connection_tests = SingleFlight(ttl=CONNECTION_TEST_CACHE_SECONDS)
+
 
 @router.post(
     "/connection/test",
@@ -25,26 +35,17 @@ async def test_connection(request: Optional[ConnectionTestRequest] = None):
     region = (request.region if request else None) or settings.aws_region
     model_id = (request.model_id if request else None) or settings.bedrock_model_id
 
-    try:
-        import boto3
-        from botocore.config import Config
-        from botocore.exceptions import ClientError, NoCredentialsError
-
-        # Configure boto3 with timeout
-        config = Config(
-            connect_timeout=10,
-            read_timeout=30,
-            retries={"max_attempts": 2},
-        )
+    return await connection_tests.do(
+        (region, model_id), lambda: run_connection_test(region, model_id)
+    )
 
-        # Create bedrock client
+
+async def run_connection_test(region: str, model_id: str) -> ConnectionTestResponse:
+    """Invoke the model with a minimal prompt and report the outcome."""
+    try:
         start_time = time.time()
 
-        bedrock = boto3.client(
-            "bedrock-runtime",
-            region_name=region,
-            config=config,
-        )
+        bedrock = get_bedrock_client(region, 30)
 
         # Test with a minimal invoke to validate credentials and model access
         test_body = {
@@ -53,11 +54,11 @@ async def test_connection(request: Optional[ConnectionTestRequest] = None):
             "messages": [{"role": "user", "content": "Hi"}],
         }
 
-        import json
-
-        response = bedrock.invoke_model(
+        # boto3 is blocking - run it off the event loop
+        await asyncio.to_thread(
+            bedrock.invoke_model,
             modelId=model_id,
-            body=json.dumps(test_body),
+            body=orjson.dumps(test_body),
             contentType="application/json",
             accept="application/json",
         )
@@ -108,14 +109,6 @@ async def test_connection(request: Optional[ConnectionTestRequest] = None):
                 message=f"AWS error: {error_code}",
                 error=error_message,
             )
-    except ImportError:
-        return ConnectionTestResponse(
-            success=False,
-            region=region,
-            model_id=model_id,
-            message="boto3 not installed",
-            error="AWS SDK (boto3) is not installed",
-        )
     except Exception as e:
         return ConnectionTestResponse(
             success=False,
@@ -8,10 +8,10 @@ from app.models.responses import (
     FileListResponse,
     UploadResponse,
 )
-from app.services.file_manager import FileManager, FileValidationError
+from app.services.file_manager import FileValidationError, file_manager
+from app.utils.validation import is_valid_file_id, is_valid_session_id
 
 router = APIRouter()
-file_manager = FileManager()
 
 
 @router.post(
@@ -33,7 +33,7 @@ async def upload_file(
     Max total per session: 500MB
     """
     # Validate session_id format
-    if not all(c.isalnum() or c == "-" for c in session_id):
+    if not is_valid_session_id(session_id):
         raise HTTPException(
             status_code=400,
             detail="Session ID must be alphanumeric with hyphens only",
@@ -55,7 +55,7 @@ async def upload_file(
 async def list_files(session_id: str):
     """List all uploaded files for a session."""
     # Validate session_id format
-    if not all(c.isalnum() or c == "-" for c in session_id):
+    if not is_valid_session_id(session_id):
         raise HTTPException(
             status_code=400,
             detail="Session ID must be alphanumeric with hyphens only",
@@ -78,9 +78,9 @@ async def list_files(session_id: str):
 async def delete_file(session_id: str, file_id: str):
     """Delete an uploaded file."""
     # Validate inputs
-    if not all(c.isalnum() or c == "-" for c in session_id):
+    if not is_valid_session_id(session_id):
         raise HTTPException(status_code=400, detail="Invalid session ID")
-    if not all(c.isalnum() or c in "-_" for c in file_id):
+    if not is_valid_file_id(file_id):
         raise HTTPException(status_code=400, detail="Invalid file ID")
 
     deleted = await file_manager.delete_file(session_id, file_id)
@@ -96,7 +96,7 @@ async def delete_file(session_id: str, file_id: str):
 )
 async def cleanup_session(session_id: str):
     """Delete all files for a session."""
-    if not all(c.isalnum() or c == "-" for c in session_id):
+    if not is_valid_session_id(session_id):
         raise HTTPException(status_code=400, detail="Invalid session ID")
 
     await file_manager.cleanup_session(session_id)
@@ -1,15 +1,15 @@
 """WebSocket endpoint handlers."""
 
 import asyncio
-import json
-import secrets
-from datetime import datetime
-from typing import Optional
+import re
+import threading
+from collections import Counter
+from typing import AsyncIterator, Callable, Optional
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from app.api.routes.analysis import analysis_jobs, update_analysis_job
-from app.api.websocket.manager import ConnectionManager, ProgressEmitter, manager
+from app.api.websocket.manager import ProgressEmitter, manager
 from app.config import settings
 from app.models.responses import (
     AnalysisStatus,
@@ -17,11 +17,39 @@ from app.models.responses import (
     WebSocketEventType,
 )
 from app.services.file_manager import file_manager
+from app.services.job_store import job_store
 from app.services.document_parser import document_parser
 from app.services.ai_analyzer import ai_analyzer
+from app.services.bedrock import get_bedrock_client
+from app.utils.validation import is_valid_session_id
 
 router = APIRouter()
 
+CHAT_STREAM_SYSTEM_PROMPT = """You are a security compliance expert assistant.
+        Help users understand compliance analysis results and provide actionable guidance.
+        Be concise and professional."""
+
+# Events after which an analysis produces no further progress
+TERMINAL_EVENT_TYPES = {
+    WebSocketEventType.ANALYSIS_COMPLETE,
+    WebSocketEventType.ANALYSIS_ERROR,
+}
+
+
+async def receive_frame(websocket: WebSocket) -> str | bytes:
+    """
+    Receive the next frame as sent, text or binary.
+
+    Both kinds hold JSON and go straight to orjson, which parses bytes
+    without decoding them to str first.
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    if message.get("bytes") is not None:
+        return message["bytes"]
+    return message["text"]
+
 
 @router.websocket("/ws/analysis/{session_id}")
 async def analysis_websocket(websocket: WebSocket, session_id: str):
@@ -29,74 +57,72 @@ async def analysis_websocket(websocket: WebSocket, session_id: str):
     WebSocket endpoint for analysis progress streaming.
 
     Connect to receive real-time updates during compliance analysis.
-    Send {"action": "start", "analysis_id": "..."} to begin analysis.
+    Send {"action": "start", "analysis_id": "..."} to subscribe to the
+    progress of an analysis started via POST /analysis/start.
     """
     # Validate session_id
-    if not all(c.isalnum() or c == "-" for c in session_id):
+    if not is_valid_session_id(session_id):
         await websocket.close(code=4000, reason="Invalid session ID")
         return
 
     await manager.connect(websocket, session_id)
 
+    # analysis_id -> task forwarding that analysis's events to this socket
+    relays: dict[str, asyncio.Task] = {}
+
     try:
         # Send connection confirmation
-        await manager.send_to_connection(
+        await manager.send_event(
             websocket,
-            WebSocketEvent(
-                event_type=WebSocketEventType.CONNECTION_STATUS,
-                message="Connected to analysis stream",
-                data={"session_id": session_id},
-            ),
+            WebSocketEventType.CONNECTION_STATUS,
+            "Connected to analysis stream",
+            {"session_id": session_id},
         )
 
         while True:
             # Wait for messages from client
-            data = await websocket.receive_text()
+            data = await receive_frame(websocket)
 
             try:
-                message = json.loads(data)
+                message = orjson.loads(data)
                 action = message.get("action")
 
                 if action == "start":
                     analysis_id = message.get("analysis_id")
-                    if analysis_id and analysis_id in analysis_jobs:
-                        # Run analysis in background
-                        asyncio.create_task(
-                            run_analysis_with_streaming(
-                                session_id, analysis_id
+                    if analysis_id and await job_store.get_job_status(analysis_id):
+                        # Analysis is already running; just tail its progress
+                        relay = relays.get(analysis_id)
+                        if relay is None or relay.done():
+                            relays[analysis_id] = asyncio.create_task(
+                                relay_analysis_events(websocket, analysis_id)
                             )
-                        )
                     else:
-                        await manager.send_to_connection(
+                        await manager.send_event(
                             websocket,
-                            WebSocketEvent(
-                                event_type=WebSocketEventType.ANALYSIS_ERROR,
-                                message="Invalid analysis ID",
-                                data={"error": "Analysis not found"},
-                            ),
+                            WebSocketEventType.ANALYSIS_ERROR,
+                            "Invalid analysis ID",
+                            {"error": "Analysis not found"},
                         )
 
                 elif action == "ping":
-                    await manager.send_to_connection(
+                    await manager.send_event(
                         websocket,
-                        WebSocketEvent(
-                            event_type=WebSocketEventType.CONNECTION_STATUS,
-                            message="pong",
-                        ),
+                        WebSocketEventType.CONNECTION_STATUS,
+                        "pong",
                     )
 
-            except json.JSONDecodeError:
-                await manager.send_to_connection(
+            except orjson.JSONDecodeError:
+                await manager.send_event(
                     websocket,
-                    WebSocketEvent(
-                        event_type=WebSocketEventType.ANALYSIS_ERROR,
-                        message="Invalid message format",
-                    ),
+                    WebSocketEventType.ANALYSIS_ERROR,
+                    "Invalid message format",
                 )
 
     except WebSocketDisconnect:
         pass
     finally:
+        for relay in relays.values():
+            relay.cancel()
         await manager.disconnect(websocket)
 
 
@@ -109,40 +135,36 @@ async def chat_websocket(websocket: WebSocket, session_id: str):
     Responses are streamed as CHAT_RESPONSE_CHUNK events.
     """
     # Validate session_id
-    if not all(c.isalnum() or c == "-" for c in session_id):
+    if not is_valid_session_id(session_id):
         await websocket.close(code=4000, reason="Invalid session ID")
         return
 
     await manager.connect(websocket, session_id)
 
     try:
-        await manager.send_to_connection(
+        await manager.send_event(
             websocket,
-            WebSocketEvent(
-                event_type=WebSocketEventType.CONNECTION_STATUS,
-                message="Connected to chat stream",
-                data={"session_id": session_id},
-            ),
+            WebSocketEventType.CONNECTION_STATUS,
+            "Connected to chat stream",
+            {"session_id": session_id},
         )
 
         while True:
-            data = await websocket.receive_text()
+            data = await receive_frame(websocket)
 
             try:
-                message = json.loads(data)
+                message = orjson.loads(data)
                 user_message = message.get("message", "").strip()
 
                 if not user_message:
                     continue
 
                 # Send typing indicator
-                await manager.send_to_connection(
+                await manager.send_event(
                     websocket,
-                    WebSocketEvent(
-                        event_type=WebSocketEventType.CHAT_TYPING,
-                        message="Assistant is typing...",
-                        data={"is_typing": True},
-                    ),
+                    WebSocketEventType.CHAT_TYPING,
+                    "Assistant is typing...",
+                    {"is_typing": True},
                 )
 
                 # Stream response
@@ -150,14 +172,12 @@ async def chat_websocket(websocket: WebSocket, session_id: str):
                     websocket, session_id, user_message
                 )
 
-            except json.JSONDecodeError:
-                await manager.send_to_connection(
+            except orjson.JSONDecodeError:
+                await manager.send_event(
                     websocket,
-                    WebSocketEvent(
-                        event_type=WebSocketEventType.CHAT_RESPONSE_COMPLETE,
-                        message="Invalid message format",
-                        data={"error": "Could not parse message"},
-                    ),
+                    WebSocketEventType.CHAT_RESPONSE_COMPLETE,
+                    "Invalid message format",
+                    {"error": "Could not parse message"},
                 )
 
     except WebSocketDisconnect:
@@ -166,11 +186,20 @@ async def chat_websocket(websocket: WebSocket, session_id: str):
         await manager.disconnect(websocket)
 
 
+# Filename markers of SOC2 Type 2 reports: soc2, soc 2, soc-2, type 2,
+# type2, typeii, type ii
+_SOC2_FILENAME_RE = re.compile(r"soc[ -]?2|type ?(?:2|ii)", re.IGNORECASE)
+
+# Sort rank of finding severities (unknown severities sort last)
+SEVERITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+# Points each finding adds to the overall risk score (capped at 100)
+SEVERITY_RISK_POINTS = {"critical": 25, "high": 15, "medium": 7, "low": 2}
+
+
 def is_soc2_document(filename: str) -> bool:
     """Check if a file appears to be a SOC2 Type 2 report."""
-    name_lower = filename.lower()
-    soc2_indicators = ["soc2", "soc 2", "soc-2", "type 2", "type2", "typeii", "type ii"]
-    return any(indicator in name_lower for indicator in soc2_indicators)
+    return _SOC2_FILENAME_RE.search(filename) is not None
 
 
 def deduplicate_findings(
@@ -186,22 +215,24 @@ def deduplicate_findings(
     - Only include findings that appear in multiple documents OR are from SOC2
     - Merge similar findings (same title/category) into one
     """
-    # Group findings by a normalized key (title + category)
-    finding_groups: dict[str, dict] = {}
+    # Group findings by a normalized (title, category) key
+    finding_groups: dict[tuple[str, str], dict] = {}
 
     for finding in all_findings:
-        # Create a normalized key for grouping
-        key = f"{finding.get('title', '').lower().strip()}|{finding.get('category', '').lower().strip()}"
+        key = (
+            (finding.get("title") or "").lower().strip(),
+            (finding.get("category") or "").lower().strip(),
+        )
 
-        if key not in finding_groups:
-            finding_groups[key] = {
-                "finding": finding.copy(),
+        group = finding_groups.get(key)
+        if group is None:
+            group = finding_groups[key] = {
+                "finding": finding,
                 "document_count": 0,
                 "soc2_count": 0,
                 "total_weight": 0,
             }
 
-        group = finding_groups[key]
         group["document_count"] += 1
 
         # SOC2 findings get double weight
@@ -211,40 +242,33 @@ def deduplicate_findings(
         else:
             group["total_weight"] += 1
 
-    # Filter and sort findings
-    deduplicated = []
+    # Include if:
+    # 1. Found in SOC2 documents (high trust), OR
+    # 2. Found in multiple documents (consistent finding)
     min_threshold = max(1, document_count // 2)  # Require at least half of documents
-
-    for key, group in finding_groups.items():
-        # Include if:
-        # 1. Found in SOC2 documents (high trust), OR
-        # 2. Found in multiple documents (consistent finding)
-        if group["soc2_count"] > 0 or group["document_count"] >= min_threshold:
-            finding = group["finding"]
-            # Remove internal tracking field
-            finding.pop("_from_soc2", None)
-            finding.pop("_source_doc", None)
-            deduplicated.append({
-                **finding,
-                "_weight": group["total_weight"],
-                "_doc_count": group["document_count"],
-            })
+    kept = [
+        group
+        for group in finding_groups.values()
+        if group["soc2_count"] > 0 or group["document_count"] >= min_threshold
+    ]
 
     # Sort by weight (higher = more important), then by severity
-    severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-    deduplicated.sort(
-        key=lambda f: (
-            -f.get("_weight", 0),
-            severity_order.get(f.get("severity", "").lower(), 4)
+    kept.sort(
+        key=lambda group: (
+            -group["total_weight"],
+            SEVERITY_RANK.get(group["finding"].get("severity", "").lower(), 4),
         )
     )
 
-    # Remove internal fields from final output
-    for finding in deduplicated:
-        finding.pop("_weight", None)
-        finding.pop("_doc_count", None)
-
-    return deduplicated
+    # Copy each group's first finding without the internal tracking fields
+    return [
+        {
+            k: v
+            for k, v in group["finding"].items()
+            if k not in ("_from_soc2", "_source_doc")
+        }
+        for group in kept
+    ]
 
 
 def consolidate_framework_coverage(framework_results: list[dict]) -> list[dict]:
@@ -274,18 +298,102 @@ def consolidate_framework_coverage(framework_results: list[dict]) -> list[dict]:
     return consolidated
 
 
+# Running analyses by ID (keeps task references alive and prevents a job
+# from being run twice)
+analysis_tasks: dict[str, asyncio.Task] = {}
+
+
+def schedule_analysis(session_id: str, analysis_id: str) -> None:
+    """Run an analysis in the background unless it is already running."""
+    if analysis_id in analysis_tasks:
+        return
+
+    task = asyncio.create_task(run_analysis_with_streaming(session_id, analysis_id))
+    analysis_tasks[analysis_id] = task
+    task.add_done_callback(lambda _: analysis_tasks.pop(analysis_id, None))
+
+
+async def get_analysis_snapshot(analysis_id: str) -> Optional[WebSocketEvent]:
+    """Build an event describing an analysis's current state, if it has one."""
+    job = await job_store.get_job_status(analysis_id)
+    if job is None or job["status"] == AnalysisStatus.PENDING:
+        return None
+
+    if job["status"] == AnalysisStatus.COMPLETED:
+        return WebSocketEvent(
+            event_type=WebSocketEventType.ANALYSIS_COMPLETE,
+            message="Analysis complete!",
+            data={"analysis_id": analysis_id},
+            progress_percentage=100,
+        )
+
+    if job["status"] == AnalysisStatus.FAILED:
+        return WebSocketEvent(
+            event_type=WebSocketEventType.ANALYSIS_ERROR,
+            message=f"Analysis failed: {job['error']}",
+            data={"error": job["error"]},
+        )
+
+    return WebSocketEvent(
+        event_type=WebSocketEventType.ANALYSIS_STARTED,
+        message=job["current_step"] or "Analysis in progress...",
+        progress_percentage=job["progress"],
+    )
+
+
+async def is_final_event(analysis_id: str, event_type: str) -> bool:
+    """Check whether a relayed progress event ends the analysis's stream."""
+    if event_type == WebSocketEventType.ANALYSIS_COMPLETE:
+        return True
+    # Error events are also sent for documents that fail while the analysis
+    # carries on; only a failed job ends the stream
+    if event_type == WebSocketEventType.ANALYSIS_ERROR:
+        job = await job_store.get_job_status(analysis_id)
+        return job is None or job["status"] == AnalysisStatus.FAILED
+    return False
+
+
+async def relay_analysis_events(websocket: WebSocket, analysis_id: str) -> None:
+    """
+    Forward an analysis's progress events to a WebSocket connection.
+
+    The relay ends, releasing its event subscription, once the analysis
+    completes or fails.
+    """
+    try:
+        async with job_store.subscribe_events(analysis_id) as events:
+            # Catch up on progress made before this client subscribed
+            snapshot = await get_analysis_snapshot(analysis_id)
+            if snapshot:
+                await websocket.send_bytes(snapshot.model_dump_json().encode())
+                if snapshot.event_type in TERMINAL_EVENT_TYPES:
+                    return
+
+            async for payload in events:
+                await websocket.send_bytes(payload.encode())
+                if await is_final_event(
+                    analysis_id, orjson.loads(payload)["event_type"]
+                ):
+                    return
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        # Connection closed; the receive loop handles cleanup
+        pass
+
+
 async def run_analysis_with_streaming(
     session_id: str, analysis_id: str
 ) -> None:
     """Run compliance analysis with real-time progress streaming."""
-    job = analysis_jobs.get(analysis_id)
+    job = await job_store.get_job(analysis_id)
     if not job:
         return
 
-    emitter = ProgressEmitter(manager, session_id, total_steps=100)
+    emitter = ProgressEmitter(analysis_id, total_steps=100)
 
     try:
-        update_analysis_job(analysis_id, status=AnalysisStatus.PROCESSING)
+        await job_store.update_analysis_job(analysis_id, status=AnalysisStatus.PROCESSING)
 
         await emitter.emit(
             WebSocketEventType.ANALYSIS_STARTED,
@@ -299,11 +407,11 @@ async def run_analysis_with_streaming(
             raise ValueError("No files to analyze")
 
         total_files = len(files)
-        frameworks = job["frameworks"]
+        frameworks = job.frameworks
 
         # Track SOC2 documents for weighting
-        soc2_documents = [f for f in files if is_soc2_document(f.original_name)]
-        soc2_count = len(soc2_documents)
+        soc2_file_ids = {f.id for f in files if is_soc2_document(f.original_name)}
+        soc2_count = len(soc2_file_ids)
 
         await emitter.emit(
             WebSocketEventType.DOCUMENT_LOADING,
@@ -323,7 +431,7 @@ async def run_analysis_with_streaming(
         all_strengths: list[dict] = []
 
         for i, uploaded_file in enumerate(files):
-            is_soc2 = is_soc2_document(uploaded_file.original_name)
+            is_soc2 = uploaded_file.id in soc2_file_ids
             doc_type = "SOC2 Type 2 Report" if is_soc2 else "Document"
 
             # Document loading
@@ -462,20 +570,19 @@ async def run_analysis_with_streaming(
                     data={"strengths_count": len(doc_strengths)},
                 )
 
-            update_analysis_job(
-                analysis_id,
-                progress=5 + (i + 1) * file_progress_share,
-                current_step=f"Analyzed {uploaded_file.original_name}",
+            await emitter.save_progress(
+                5 + (i + 1) * file_progress_share,
+                f"Analyzed {uploaded_file.original_name}",
             )
 
             # Add delay between documents to avoid rate limiting
-            if i < total_files - 1:
+            if i < total_files - 1 and settings.analysis_document_delay_seconds:
                 await emitter.emit(
                     WebSocketEventType.DOCUMENT_ANALYZING,
                     "Waiting before next document to avoid rate limits...",
                     progress_override=5 + (i + 1) * file_progress_share,
                 )
-                await asyncio.sleep(3)  # 3 second delay between documents
+                await asyncio.sleep(settings.analysis_document_delay_seconds)
 
         # Consolidate and deduplicate
         await emitter.emit(
@@ -483,7 +590,6 @@ async def run_analysis_with_streaming(
             "Consolidating findings across all documents...",
             progress_override=75,
         )
-        await asyncio.sleep(0.5)
 
         # Deduplicate findings with SOC2 weighting
         deduplicated_findings = deduplicate_findings(all_findings, total_files, soc2_count)
@@ -519,8 +625,6 @@ async def run_analysis_with_streaming(
             progress_override=80,
         )
 
-        await asyncio.sleep(1.5)
-
         # Calculate Security Posture Score (0-100, higher is better)
         # Based on framework coverage - average of all framework coverage percentages
         avg_coverage = (
@@ -539,12 +643,17 @@ async def run_analysis_with_streaming(
         else:
             security_posture_level = "Weak"
 
+        # Tally findings by severity once; the risk score and the control
+        # effectiveness penalty below both derive from these counts
+        severity_counts = Counter(
+            f.get("severity", "").lower() for f in deduplicated_findings
+        )
+
         # Calculate Overall Risk Score (0-100, lower is better)
         # Based on findings severity - weighted sum normalized to 100
-        severity_weights = {"critical": 25, "high": 15, "medium": 7, "low": 2}
         total_risk_points = sum(
-            severity_weights.get(f.get("severity", "").lower(), 0)
-            for f in deduplicated_findings
+            SEVERITY_RISK_POINTS.get(severity, 0) * count
+            for severity, count in severity_counts.items()
         )
         # Cap at 100, with baseline of 0 if no findings
         overall_risk_score = min(100, total_risk_points)
@@ -589,8 +698,8 @@ async def run_analysis_with_streaming(
         # Boost for strengths (max +15%)
         strength_bonus = min(15, len(cleaned_strengths) * 3)
         # Penalty for critical/high findings (max -30%)
-        critical_count = sum(1 for f in deduplicated_findings if f.get("severity", "").lower() == "critical")
-        high_count = sum(1 for f in deduplicated_findings if f.get("severity", "").lower() == "high")
+        critical_count = severity_counts["critical"]
+        high_count = severity_counts["high"]
         finding_penalty = min(30, critical_count * 10 + high_count * 5)
 
         control_effectiveness_score = max(0, min(100, base_effectiveness + strength_bonus - finding_penalty))
@@ -679,7 +788,7 @@ async def run_analysis_with_streaming(
             }
 
         # Generate AI-powered executive summary
-        vendor_name = job.get("vendor_name")
+        vendor_name = job.vendor_name
         results["executive_summary"] = await ai_analyzer.generate_consolidated_summary(
             all_findings=deduplicated_findings,
             all_strengths=all_strengths,
@@ -689,14 +798,13 @@ async def run_analysis_with_streaming(
             vendor_name=vendor_name,
         )
 
-        # Calculate overall score
-        if results["frameworks"]:
-            results["overall_compliance_score"] = sum(
-                fw["coverage_percentage"] for fw in results["frameworks"]
-            ) / len(results["frameworks"])
+        # Overall score is the mean framework coverage computed above
+        if consolidated_frameworks:
+            results["overall_compliance_score"] = avg_coverage
 
         # Complete
-        update_analysis_job(
+        await emitter.close()
+        await job_store.update_analysis_job(
             analysis_id,
             status=AnalysisStatus.COMPLETED,
             progress=100,
@@ -716,7 +824,8 @@ async def run_analysis_with_streaming(
         )
 
     except Exception as e:
-        update_analysis_job(
+        await emitter.close()
+        await job_store.update_analysis_job(
             analysis_id,
             status=AnalysisStatus.FAILED,
             error=str(e),
@@ -729,6 +838,69 @@ async def run_analysis_with_streaming(
         )
 
 
+_STREAM_END = object()
+
+# Streamed chat text is sent once this many characters are buffered, or
+# when this many seconds have passed since the last frame
+CHAT_CHUNK_MIN_CHARS = 64
+CHAT_CHUNK_MAX_DELAY = 0.02
+
+
+async def iter_model_stream(
+    bedrock,
+    idle_timeout: Optional[Callable[[], Optional[float]]] = None,
+    **request,
+) -> AsyncIterator[Optional[dict]]:
+    """
+    Yield events from invoke_model_with_response_stream without blocking.
+
+    The botocore call and its event stream are synchronous, so they run in
+    a worker thread that hands events to the event loop through a queue.
+    ``idle_timeout`` is called before each wait; when it returns a number,
+    None is yielded if no event arrives within that many seconds, so
+    callers can flush buffered output.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stopped = threading.Event()
+
+    def produce() -> None:
+        try:
+            response = bedrock.invoke_model_with_response_stream(**request)
+            stream = response.get("body", [])
+            try:
+                for event in stream:
+                    if stopped.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, event)
+            finally:
+                if hasattr(stream, "close"):
+                    stream.close()
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, _STREAM_END)
+
+    producer = loop.run_in_executor(None, produce)
+    try:
+        while True:
+            try:
+                timeout = idle_timeout() if idle_timeout else None
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if item is _STREAM_END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Let the worker stop early if the consumer went away mid-stream
+        stopped.set()
+        await asyncio.shield(producer)
+
+
 async def stream_chat_response(
     websocket: WebSocket,
     session_id: str,
@@ -736,75 +908,78 @@ async def stream_chat_response(
 ) -> None:
     """Stream chat response chunks via WebSocket."""
     try:
-        import json as json_lib
-
-        import boto3
-        from botocore.config import Config
-
-        config = Config(
-            connect_timeout=10,
-            read_timeout=settings.bedrock_timeout,
-        )
-
-        bedrock = boto3.client(
-            "bedrock-runtime",
-            region_name=settings.aws_region,
-            config=config,
-        )
-
-        # Build system prompt
-        system_prompt = """You are a security compliance expert assistant.
-        Help users understand compliance analysis results and provide actionable guidance.
-        Be concise and professional."""
+        bedrock = get_bedrock_client(settings.aws_region, settings.bedrock_timeout)
 
         request_body = {
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": settings.bedrock_max_tokens,
             "temperature": settings.bedrock_temperature,
-            "system": system_prompt,
+            "system": CHAT_STREAM_SYSTEM_PROMPT,
             "messages": [{"role": "user", "content": user_message}],
         }
 
-        # Use streaming API
-        response = bedrock.invoke_model_with_response_stream(
+        loop = asyncio.get_running_loop()
+        parts: list[str] = []
+        pending: list[str] = []
+        pending_chars = 0
+        last_flush = loop.time()
+
+        async def flush() -> None:
+            nonlocal pending_chars, last_flush
+            if pending:
+                text = "".join(pending)
+                pending.clear()
+                await manager.send_event(
+                    websocket,
+                    WebSocketEventType.CHAT_RESPONSE_CHUNK,
+                    text,
+                    {"chunk": text},
+                )
+            pending_chars = 0
+            last_flush = loop.time()
+
+        async for event in iter_model_stream(
+            bedrock,
+            # Only wake up on pauses while there is buffered text to send
+            idle_timeout=lambda: CHAT_CHUNK_MAX_DELAY if pending else None,
             modelId=settings.bedrock_model_id,
-            body=json_lib.dumps(request_body),
+            body=orjson.dumps(request_body),
             contentType="application/json",
             accept="application/json",
-        )
-
-        full_response = ""
-        for event in response.get("body", []):
-            chunk = json_lib.loads(event.get("chunk", {}).get("bytes", b"{}"))
+        ):
+            if event is None:
+                # The model paused; don't hold back what has arrived so far
+                await flush()
+                continue
+            if "chunk" not in event:
+                continue
+            chunk = orjson.loads(event["chunk"]["bytes"])
 
             if chunk.get("type") == "content_block_delta":
                 text = chunk.get("delta", {}).get("text", "")
                 if text:
-                    full_response += text
-                    await manager.send_to_connection(
-                        websocket,
-                        WebSocketEvent(
-                            event_type=WebSocketEventType.CHAT_RESPONSE_CHUNK,
-                            message=text,
-                            data={"chunk": text},
-                        ),
-                    )
-
-        await manager.send_to_connection(
+                    parts.append(text)
+                    pending.append(text)
+                    pending_chars += len(text)
+                    # Deltas are often a few tokens; send them in batches
+                    if (
+                        pending_chars >= CHAT_CHUNK_MIN_CHARS
+                        or loop.time() - last_flush >= CHAT_CHUNK_MAX_DELAY
+                    ):
+                        await flush()
+
+        await flush()
+        await manager.send_event(
             websocket,
-            WebSocketEvent(
-                event_type=WebSocketEventType.CHAT_RESPONSE_COMPLETE,
-                message="Response complete",
-                data={"full_response": full_response},
-            ),
+            WebSocketEventType.CHAT_RESPONSE_COMPLETE,
+            "Response complete",
+            {"full_response": "".join(parts)},
         )
 
     except Exception as e:
-        await manager.send_to_connection(
+        await manager.send_event(
             websocket,
-            WebSocketEvent(
-                event_type=WebSocketEventType.CHAT_RESPONSE_COMPLETE,
-                message=f"Error: {str(e)}",
-                data={"error": str(e)},
-            ),
+            WebSocketEventType.CHAT_RESPONSE_COMPLETE,
+            f"Error: {str(e)}",
+            {"error": str(e)},
         )
@@ -1,14 +1,42 @@
 """WebSocket connection manager."""
 
 import asyncio
-import json
-from datetime import datetime
-from typing import Any, Callable, Optional
+import time
+from typing import Any, Optional
 
+import orjson
 from fastapi import WebSocket
 from starlette.websockets import WebSocketState
 
 from app.models.responses import WebSocketEvent, WebSocketEventType
+from app.services.job_store import job_store
+from app.utils.clock import utc_now
+
+
+def encode_event(
+    event_type: WebSocketEventType,
+    message: Optional[str] = None,
+    data: Optional[dict[str, Any]] = None,
+    progress_percentage: Optional[float] = None,
+) -> bytes:
+    """
+    Serialize an event to UTF-8 JSON without building a WebSocketEvent model.
+
+    Produces the same JSON as ``WebSocketEvent.model_dump_json()``, for the
+    per-frame send paths where model validation is pure overhead.
+    """
+    return orjson.dumps(
+        {
+            "event_type": event_type,
+            "timestamp": utc_now(),
+            "data": data or {},
+            "progress_percentage": (
+                None if progress_percentage is None else float(progress_percentage)
+            ),
+            "message": message,
+        },
+        option=orjson.OPT_UTC_Z,
+    )
 
 
 class ConnectionManager:
@@ -58,13 +86,13 @@ class ConnectionManager:
         if not connections:
             return
 
-        message = event.model_dump_json()
+        message = event.model_dump_json().encode()
         disconnected = []
 
         for connection in connections:
             try:
                 if connection.client_state == WebSocketState.CONNECTED:
-                    await connection.send_text(message)
+                    await connection.send_bytes(message)
                 else:
                     disconnected.append(connection)
             except Exception:
@@ -80,9 +108,28 @@ class ConnectionManager:
         event: WebSocketEvent,
     ) -> None:
         """Send event to a specific connection."""
+        await self.send_raw(websocket, event.model_dump_json().encode())
+
+    async def send_event(
+        self,
+        websocket: WebSocket,
+        event_type: WebSocketEventType,
+        message: Optional[str] = None,
+        data: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """Send an event to a specific connection, serialized directly."""
+        await self.send_raw(websocket, encode_event(event_type, message, data))
+
+    async def send_raw(self, websocket: WebSocket, payload: bytes) -> None:
+        """
+        Send an already serialized event to a specific connection.
+
+        Events go out as binary frames holding UTF-8 JSON, so encoded
+        payloads are sent as-is instead of being decoded to text first.
+        """
         try:
             if websocket.client_state == WebSocketState.CONNECTED:
-                await websocket.send_text(event.model_dump_json())
+                await websocket.send_bytes(payload)
         except Exception:
             await self.disconnect(websocket)
 
@@ -103,18 +150,40 @@ class ConnectionManager:
 
 
 class ProgressEmitter:
-    """Helper class for emitting progress events during analysis."""
+    """Helper class for emitting progress events during analysis.
+
+    Events are published on the analysis's channel in the job store, so any
+    WebSocket subscribed to the analysis (on any worker) receives them.
+    Events that set progress explicitly also persist it on the job for late
+    subscribers, at most every SAVE_INTERVAL seconds (bursts are coalesced
+    into one write); other events carry the last progress set.
+    """
+
+    SAVE_INTERVAL = 0.1  # seconds
+
+    # Events whose progress is persisted immediately
+    IMMEDIATE_SAVE_EVENTS = {
+        WebSocketEventType.ANALYSIS_STARTED,
+    }
+
+    # Terminal events; the analysis writes the final job state itself
+    UNSAVED_EVENTS = {
+        WebSocketEventType.ANALYSIS_COMPLETE,
+    }
 
     def __init__(
         self,
-        manager: ConnectionManager,
-        session_id: str,
+        analysis_id: str,
         total_steps: int = 100,
     ):
-        self.manager = manager
-        self.session_id = session_id
+        self.analysis_id = analysis_id
         self.total_steps = total_steps
         self.current_step = 0
+        self.progress = 0.0
+        self._last_saved = 0.0
+        self._pending_save: Optional[tuple[float, str]] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def emit(
         self,
@@ -124,27 +193,80 @@ class ProgressEmitter:
         progress_override: Optional[float] = None,
     ) -> None:
         """Emit a progress event."""
-        progress = progress_override
-        if progress is None:
-            progress = (self.current_step / self.total_steps) * 100
-
-        event = WebSocketEvent(
-            event_type=event_type,
-            timestamp=datetime.utcnow(),
-            data=data or {},
-            progress_percentage=min(progress, 100),
-            message=message,
+        if progress_override is not None:
+            self.progress = min(progress_override, 100)
+            if event_type not in self.UNSAVED_EVENTS:
+                await self._save_progress(
+                    self.progress,
+                    message,
+                    immediate=event_type in self.IMMEDIATE_SAVE_EVENTS,
+                )
+
+        await job_store.publish_event(
+            self.analysis_id,
+            encode_event(event_type, message, data, self.progress).decode(),
         )
 
-        await self.manager.send_to_session(self.session_id, event)
+    async def save_progress(self, progress: float, step: str) -> None:
+        """Persist progress without emitting an event, coalesced like emit."""
+        self.progress = min(progress, 100)
+        await self._save_progress(self.progress, step)
+
+    async def _save_progress(
+        self, progress: float, step: str, immediate: bool = False
+    ) -> None:
+        """Persist progress, coalescing writes that arrive too quickly."""
+        elapsed = time.monotonic() - self._last_saved
+        if immediate or elapsed >= self.SAVE_INTERVAL:
+            await self._drop_pending_save()
+            self._last_saved = time.monotonic()
+            await job_store.update_analysis_job(
+                self.analysis_id, progress=progress, current_step=step
+            )
+            return
+
+        # Keep only the latest value; write it when the interval ends
+        self._pending_save = (progress, step)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.SAVE_INTERVAL - elapsed, self._start_flush
+            )
+
+    async def _drop_pending_save(self) -> None:
+        """Discard a queued write and wait out one already in progress."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending_save = None
+        flush_task = self._flush_task
+        if flush_task is not None and flush_task is not asyncio.current_task():
+            self._flush_task = None
+            # Let a started write land first so it can't overwrite this one
+            await flush_task
+
+    async def close(self) -> None:
+        """Stop coalesced writes; call before writing the final job state."""
+        await self._drop_pending_save()
+
+    def _start_flush(self) -> None:
+        self._flush_handle = None
+        self._flush_task = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        if self._pending_save is None:
+            return
+        progress, step = self._pending_save
+        await self._save_progress(progress, step, immediate=True)
 
     async def increment(self, steps: int = 1) -> None:
         """Increment the current step count."""
         self.current_step = min(self.current_step + steps, self.total_steps)
+        self.progress = (self.current_step / self.total_steps) * 100
 
     async def set_progress(self, progress: float) -> None:
         """Set progress directly as percentage."""
         self.current_step = int((progress / 100) * self.total_steps)
+        self.progress = min(progress, 100)
 
 
 # Global connection manager
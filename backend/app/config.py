@@ -36,6 +36,9 @@ class Settings(BaseSettings):
     upload_dir: Path = Field(default=Path("/tmp/analyzer-uploads"))
     max_file_size_mb: int = 100
     max_total_size_mb: int = 500
+    # Seconds to reuse a session's file listing (0 disables). Per-process,
+    # so keep it short or off when several workers share the upload dir
+    file_listing_cache_seconds: float = 1.0
     allowed_extensions: set[str] = Field(
         default={".pdf", ".docx", ".xlsx", ".xls", ".csv", ".txt", ".md"}
     )
@@ -67,6 +70,21 @@ class Settings(BaseSettings):
     bedrock_max_tokens: int = 4096
     bedrock_temperature: float = 0.3
     bedrock_timeout: int = 60
+    # Approximate input token budget for chat prompts (system + history)
+    bedrock_max_input_tokens: int = 16000
+    # Pause between documents in an analysis to stay under Bedrock rate limits
+    analysis_document_delay_seconds: float = 3.0
+
+    # Job/Chat State Storage
+    # Set REDIS_URL to share analysis jobs and chat history across workers
+    redis_url: Optional[str] = Field(default=None)
+    chat_history_max_messages: int = 200
+    # In-memory store bounds (entries also expire after session_ttl_hours)
+    max_jobs: int = 10000
+    max_chat_sessions: int = 10000
+
+    # Worker processes for PDF rendering (0 renders in a thread instead)
+    pdf_render_workers: int = 2
 
     # Compliance Analyzer Path
     analyzer_package_path: Optional[str] = Field(default=None)
@@ -8,10 +8,13 @@ from pathlib import Path
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import Message, Receive, Scope, Send
 
 from app.api.routes import analysis, chat, connection, export, upload
 from app.api.websocket import handlers as ws_handlers
@@ -101,6 +104,42 @@ class JSONBodySizeLimitMiddleware(BaseHTTPMiddleware):
         return await call_next(request)
 
 
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZip-compress responses (notably JSON exports), except event streams
+    and PDFs.
+
+    The gzip stream isn't flushed per chunk, so progress events would be
+    held back until the stream ends; PDFs are already compressed.
+
+    A compressed body is not byte-identical to the one its ETag was computed
+    for, so the ETag of a gzipped response is downgraded to a weak one.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path.endswith("/events") or path.startswith(
+                f"{settings.api_prefix}/export/pdf/"
+            ):
+                await self.app(scope, receive, send)
+                return
+
+        async def send_with_weak_etag(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                etag = headers.get("etag")
+                if (
+                    etag
+                    and not etag.startswith("W/")
+                    and headers.get("content-encoding") == "gzip"
+                ):
+                    headers["etag"] = f"W/{etag}"
+            await send(message)
+
+        await super().__call__(scope, receive, send_with_weak_etag)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
@@ -112,6 +151,7 @@ async def lifespan(app: FastAPI):
     # Start background cleanup task
     import asyncio
     from app.services.file_manager import file_manager
+    from app.services.job_store import job_store
 
     async def cleanup_loop():
         """Periodically clean up expired sessions."""
@@ -127,6 +167,7 @@ async def lifespan(app: FastAPI):
                 logger.error(f"Session cleanup error: {e}")
 
     cleanup_task = asyncio.create_task(cleanup_loop())
+    export.start_pdf_pool()
 
     yield
 
@@ -136,6 +177,8 @@ async def lifespan(app: FastAPI):
         await cleanup_task
     except asyncio.CancelledError:
         pass
+    await job_store.close()
+    export.shutdown_pdf_pool()
     logger.info("Application shutdown complete")
 
 
@@ -144,6 +187,7 @@ app = FastAPI(
     description="AI-powered vendor security compliance analyzer",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
 )
@@ -152,6 +196,10 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Response compression (JSON exports shrink several-fold); added first so
+# it runs innermost and sees route responses before they are re-streamed
+app.add_middleware(CompressionMiddleware, minimum_size=1024, compresslevel=6)
+
 # Security middleware (order matters - first added = last executed)
 app.add_middleware(SecurityHeadersMiddleware)
 app.add_middleware(RequestSizeLimitMiddleware)
@@ -5,6 +5,8 @@ from typing import Optional
 
 from pydantic import BaseModel, Field, field_validator
 
+from app.utils.validation import is_valid_session_id
+
 
 def sanitize_text_input(value: Optional[str]) -> Optional[str]:
     """Sanitize text input to prevent XSS and injection attacks."""
@@ -74,7 +76,7 @@ class AnalysisRequest(BaseModel):
     @classmethod
     def validate_session_id(cls, v: str) -> str:
         # Only allow alphanumeric and hyphens
-        if not all(c.isalnum() or c == "-" for c in v):
+        if not is_valid_session_id(v):
             raise ValueError("Session ID must be alphanumeric with hyphens only")
         return v
 
@@ -97,7 +99,7 @@ class ChatRequest(BaseModel):
     @field_validator("session_id")
     @classmethod
     def validate_session_id(cls, v: str) -> str:
-        if not all(c.isalnum() or c == "-" for c in v):
+        if not is_valid_session_id(v):
             raise ValueError("Session ID must be alphanumeric with hyphens only")
         return v
 
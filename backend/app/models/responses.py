@@ -6,6 +6,8 @@ from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
+from app.utils.clock import utc_now
+
 
 class UploadedFile(BaseModel):
     """Represents an uploaded file."""
@@ -191,7 +193,7 @@ class WebSocketEvent(BaseModel):
     """WebSocket event payload."""
 
     event_type: WebSocketEventType
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=utc_now)
     data: dict[str, Any] = Field(default_factory=dict)
     progress_percentage: Optional[float] = None
     message: Optional[str] = None
@@ -0,0 +1,26 @@
+"""Shared AWS Bedrock runtime clients for request handlers."""
+
+from functools import lru_cache
+
+import boto3
+from botocore.config import Config
+
+
+@lru_cache(maxsize=16)
+def get_bedrock_client(region: str, read_timeout: int):
+    """
+    Get a bedrock-runtime client for a region, created once and reused.
+
+    boto3 clients are thread-safe, so one instance (and its connection pool)
+    serves all requests, including calls run via asyncio.to_thread.
+    """
+    config = Config(
+        connect_timeout=10,
+        read_timeout=read_timeout,
+        retries={"max_attempts": 2},
+    )
+    return boto3.client(
+        "bedrock-runtime",
+        region_name=region,
+        config=config,
+    )
@@ -1,19 +1,29 @@
 """Secure file management service."""
 
+import asyncio
 import hashlib
 import os
+import re
 import secrets
 import shutil
-from datetime import datetime, timedelta
+from datetime import timedelta
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
 import aiofiles
 import magic
+from cachetools import TTLCache
 from fastapi import UploadFile
 
 from app.config import settings
 from app.models.responses import UploadedFile
+from app.utils.clock import from_timestamp, utc_now
+
+# Characters stripped from session IDs before they are used as directory names
+_UNSAFE_SESSION_CHARS_RE = re.compile(r"[^A-Za-z0-9-]")
+
+# Block size used when copying upload bodies to disk
+UPLOAD_COPY_BLOCK_SIZE = 1024 * 1024
 
 
 class FileValidationError(Exception):
@@ -36,13 +46,17 @@ class FileManager:
         self.upload_dir = upload_dir or settings.upload_dir
         self.upload_dir.mkdir(parents=True, exist_ok=True)
         self._mime = magic.Magic(mime=True)
+        # Recent listings per session directory; dropped when files change
+        self._listings: Optional[TTLCache[Path, list[UploadedFile]]] = (
+            TTLCache(maxsize=1024, ttl=settings.file_listing_cache_seconds)
+            if settings.file_listing_cache_seconds
+            else None
+        )
 
     def _get_session_dir(self, session_id: str) -> Path:
         """Get isolated directory for session."""
         # Sanitize session_id to prevent path traversal
-        safe_session_id = "".join(
-            c for c in session_id if c.isalnum() or c == "-"
-        )
+        safe_session_id = _UNSAFE_SESSION_CHARS_RE.sub("", session_id)
         return self.upload_dir / safe_session_id
 
     def _generate_file_id(self) -> str:
@@ -109,6 +123,25 @@ class FileManager:
             name = name[: 255 - len(ext)] + ext
         return name
 
+    def _copy_upload(
+        self, source: BinaryIO, file_path: Path, current_size: int
+    ) -> int:
+        """Copy an upload body to disk with size checks, returning its size."""
+        total_size = 0
+        with open(file_path, "wb") as out_file:
+            while chunk := source.read(UPLOAD_COPY_BLOCK_SIZE):
+                total_size += len(chunk)
+                if total_size > settings.max_file_size_bytes:
+                    raise FileValidationError(
+                        f"File exceeds maximum size of {settings.max_file_size_mb}MB"
+                    )
+                if current_size + total_size > settings.max_total_size_bytes:
+                    raise FileValidationError(
+                        f"Session total exceeds {settings.max_total_size_mb}MB"
+                    )
+                out_file.write(chunk)
+        return total_size
+
     def _compute_hash(self, file_path: Path) -> str:
         """Compute SHA256 hash of file."""
         sha256_hash = hashlib.sha256()
@@ -150,21 +183,12 @@ class FileManager:
             f.stat().st_size for f in session_dir.iterdir() if f.is_file()
         )
 
-        # Read and save file with size check
-        total_size = 0
+        # Read and save file with size check, in one worker thread rather
+        # than a threadpool hop per chunk read and written
         try:
-            async with aiofiles.open(file_path, "wb") as out_file:
-                while chunk := await file.read(8192):
-                    total_size += len(chunk)
-                    if total_size > settings.max_file_size_bytes:
-                        raise FileValidationError(
-                            f"File exceeds maximum size of {settings.max_file_size_mb}MB"
-                        )
-                    if current_size + total_size > settings.max_total_size_bytes:
-                        raise FileValidationError(
-                            f"Session total exceeds {settings.max_total_size_mb}MB"
-                        )
-                    await out_file.write(chunk)
+            total_size = await asyncio.to_thread(
+                self._copy_upload, file.file, file_path, current_size
+            )
         except FileValidationError:
             # Clean up partial file
             if file_path.exists():
@@ -183,47 +207,70 @@ class FileManager:
         meta_path = session_dir / f"{file_id}.meta"
         async with aiofiles.open(meta_path, "w") as meta_file:
             await meta_file.write(f"{original_name}\n{mime_type}")
+        self._invalidate_listing(session_dir)
 
         return UploadedFile(
             id=file_id,
             original_name=original_name,
             size_bytes=total_size,
             mime_type=mime_type,
-            uploaded_at=datetime.utcnow(),
+            uploaded_at=utc_now(),
         )
 
     async def get_session_files(self, session_id: str) -> list[UploadedFile]:
         """Get all files for a session."""
         session_dir = self._get_session_dir(session_id)
-        if not session_dir.exists():
+        if self._listings is not None and session_dir in self._listings:
+            return list(self._listings[session_dir])
+
+        # Many tiny reads and stats: one worker thread beats a hop per call
+        files = await asyncio.to_thread(self._scan_session_files, session_dir)
+        if self._listings is not None:
+            self._listings[session_dir] = files
+        return list(files)
+
+    def _invalidate_listing(self, session_dir: Path) -> None:
+        if self._listings is not None:
+            self._listings.pop(session_dir, None)
+
+    def _scan_session_files(self, session_dir: Path) -> list[UploadedFile]:
+        """List a session's files with a single directory scan."""
+        try:
+            entries = list(os.scandir(session_dir))
+        except FileNotFoundError:
             return []
 
+        # File IDs contain no dots, so the ID is the name up to the first one
+        data_files = {
+            entry.name.partition(".")[0]: entry
+            for entry in entries
+            if not entry.name.endswith(".meta")
+        }
+
         files = []
-        for meta_file in session_dir.glob("*.meta"):
-            file_id = meta_file.stem
-            async with aiofiles.open(meta_file, "r") as f:
-                content = await f.read()
-                lines = content.strip().split("\n")
-                original_name = lines[0]
-                mime_type = lines[1] if len(lines) > 1 else "application/octet-stream"
-
-            # Find corresponding data file
-            data_files = list(session_dir.glob(f"{file_id}.*"))
-            data_files = [f for f in data_files if not f.suffix == ".meta"]
-
-            if data_files:
-                data_file = data_files[0]
-                files.append(
-                    UploadedFile(
-                        id=file_id,
-                        original_name=original_name,
-                        size_bytes=data_file.stat().st_size,
-                        mime_type=mime_type,
-                        uploaded_at=datetime.fromtimestamp(
-                            data_file.stat().st_mtime
-                        ),
-                    )
+        for entry in entries:
+            if not entry.name.endswith(".meta"):
+                continue
+            file_id = entry.name[: -len(".meta")]
+            data_file = data_files.get(file_id)
+            if data_file is None:
+                continue
+
+            with open(entry.path, "r") as f:
+                lines = f.read().strip().split("\n")
+            original_name = lines[0]
+            mime_type = lines[1] if len(lines) > 1 else "application/octet-stream"
+
+            stat = data_file.stat()
+            files.append(
+                UploadedFile(
+                    id=file_id,
+                    original_name=original_name,
+                    size_bytes=stat.st_size,
+                    mime_type=mime_type,
+                    uploaded_at=from_timestamp(stat.st_mtime),
                 )
+            )
 
         return files
 
@@ -251,6 +298,7 @@ class FileManager:
             file_path.unlink()
             deleted = True
 
+        self._invalidate_listing(session_dir)
         return deleted
 
     async def cleanup_session(self, session_id: str) -> None:
@@ -258,12 +306,13 @@ class FileManager:
         session_dir = self._get_session_dir(session_id)
         if session_dir.exists():
             shutil.rmtree(session_dir)
+        self._invalidate_listing(session_dir)
 
     async def cleanup_expired_sessions(
         self, max_age_hours: int = 24
     ) -> int:
         """Clean up sessions older than max_age_hours."""
-        cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+        cutoff = utc_now() - timedelta(hours=max_age_hours)
         cleaned = 0
 
         for session_dir in self.upload_dir.iterdir():
@@ -271,9 +320,10 @@ class FileManager:
                 continue
 
             # Check directory modification time
-            mtime = datetime.fromtimestamp(session_dir.stat().st_mtime)
+            mtime = from_timestamp(session_dir.stat().st_mtime)
             if mtime < cutoff:
                 shutil.rmtree(session_dir)
+                self._invalidate_listing(session_dir)
                 cleaned += 1
 
         return cleaned
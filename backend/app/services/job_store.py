@@ -0,0 +1,517 @@
+"""Storage for analysis jobs and chat histories.
+
+Uses Redis when ``REDIS_URL`` is configured so that multiple API workers
+share job state and progress events (via pub/sub), with per-key TTLs
+bounding memory. Without Redis, state is kept in process-local dictionaries
+(suitable for single-worker development).
+"""
+
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
+
+import redis.asyncio as redis
+from cachetools import LRUCache, TTLCache
+
+from app.config import settings
+from app.models.responses import AnalysisStatus
+from app.utils.clock import from_timestamp, utc_now
+
+# Fields returned by status polls (kept small so Redis can HMGET them)
+STATUS_FIELDS = ("status", "progress", "current_step", "error")
+
+# Encoded exports kept by the in-memory store (least recently used
+# evicted first)
+EXPORT_CACHE_MAX_ENTRIES = 32
+EXPORT_FORMATS = ("json", "json-pretty", "pdf")
+
+# Job fields serialized as JSON inside the Redis hash
+_JSON_FIELDS = {"frameworks", "results"}
+_DATETIME_FIELDS = {"started_at", "completed_at"}
+
+
+@dataclass(slots=True)
+class AnalysisJob:
+    """An analysis job, its progress, and (once completed) its results."""
+
+    session_id: str
+    frameworks: list[str]
+    vendor_name: Optional[str] = None
+    reviewed_by: Optional[str] = None
+    ticket_number: Optional[str] = None
+    status: AnalysisStatus = AnalysisStatus.PENDING
+    progress: float = 0
+    current_step: Optional[str] = None
+    results: Optional[dict] = None
+    error: Optional[str] = None
+    started_at: datetime = field(default_factory=utc_now)
+    completed_at: Optional[datetime] = None
+
+
+_JOB_FIELDS = tuple(f.name for f in fields(AnalysisJob))
+_METADATA_FIELDS = tuple(name for name in _JOB_FIELDS if name != "results")
+
+
+def _encode_value(name: str, value: Any) -> str:
+    """Encode a job field for storage in a Redis hash."""
+    if name in _JSON_FIELDS:
+        return json.dumps(value, default=str)
+    if name in _DATETIME_FIELDS:
+        return repr(value.timestamp())
+    if isinstance(value, AnalysisStatus):
+        return value.value
+    return str(value)
+
+
+def _decode_value(name: str, value: str) -> Any:
+    """Decode a job field read from a Redis hash."""
+    if name in _JSON_FIELDS:
+        return json.loads(value)
+    if name in _DATETIME_FIELDS:
+        return from_timestamp(float(value))
+    if name == "status":
+        return AnalysisStatus(value)
+    if name == "progress":
+        return float(value)
+    return value
+
+
+def _encode_message(message: dict) -> str:
+    """Encode a chat message for storage in a Redis list."""
+    return json.dumps({**message, "timestamp": message["timestamp"].timestamp()})
+
+
+def _decode_message(raw: str) -> dict:
+    """Decode a chat message read from a Redis list."""
+    message = json.loads(raw)
+    message["timestamp"] = from_timestamp(message["timestamp"])
+    return message
+
+
+def _history_offset(first: Optional[dict], cursor: int) -> int:
+    """
+    Map a history cursor to a list offset.
+
+    Messages carry a per-session ``seq`` that trimming doesn't renumber, so
+    the cursor is a sequence number; the offset is taken from the oldest
+    message still kept. A cursor that has already been trimmed away starts
+    at the oldest kept message.
+    """
+    if first is None:
+        return 0
+    return max(cursor - first.get("seq", 0), 0)
+
+
+class BaseJobStore(ABC):
+    """Storage interface for analysis jobs and chat histories."""
+
+    @abstractmethod
+    async def create_job(self, analysis_id: str, job: AnalysisJob) -> None:
+        """Store a new analysis job."""
+
+    @abstractmethod
+    async def get_job(
+        self, analysis_id: str, include_results: bool = True
+    ) -> Optional[AnalysisJob]:
+        """Get a job, optionally without its (potentially large) results."""
+
+    @abstractmethod
+    async def get_job_status(self, analysis_id: str) -> Optional[dict]:
+        """Get only the STATUS_FIELDS of a job."""
+
+    @abstractmethod
+    async def update_job(self, analysis_id: str, fields: dict) -> None:
+        """Set fields of an existing job; unknown jobs are ignored."""
+
+    @abstractmethod
+    async def publish_event(self, analysis_id: str, payload: str) -> None:
+        """Send an encoded progress event to the analysis's subscribers."""
+
+    @abstractmethod
+    def subscribe_events(
+        self, analysis_id: str
+    ) -> AbstractAsyncContextManager[AsyncIterator[str]]:
+        """Subscribe to an analysis's progress events for the context's life."""
+
+    @abstractmethod
+    async def get_session_analysis_id(self, session_id: str) -> Optional[str]:
+        """Get the latest analysis with results for a session."""
+
+    @abstractmethod
+    async def get_results(self, analysis_id: str) -> Optional[dict]:
+        """Get only the results of a job."""
+
+    @abstractmethod
+    async def get_analysis_context(self, analysis_id: str) -> Optional[str]:
+        """Get the cached chat context rendered from a job's results."""
+
+    @abstractmethod
+    async def set_analysis_context(self, analysis_id: str, context: str) -> None:
+        """Cache the chat context rendered from a job's results."""
+
+    @abstractmethod
+    async def get_export(self, analysis_id: str, fmt: str) -> Optional[bytes]:
+        """Get a cached export of a job's results."""
+
+    @abstractmethod
+    async def set_export(self, analysis_id: str, fmt: str, data: bytes) -> None:
+        """Cache an export of a job's results."""
+
+    @abstractmethod
+    async def append_chat_message(self, session_id: str, message: dict) -> None:
+        """Append a message to a session's chat history."""
+
+    @abstractmethod
+    async def get_chat_history(
+        self,
+        session_id: str,
+        limit: Optional[int] = None,
+        cursor: Optional[int] = None,
+    ) -> list[dict]:
+        """
+        Get a session's chat history, oldest message first.
+
+        Without a cursor, the last ``limit`` messages are returned; with one,
+        up to ``limit`` messages starting at that sequence number.
+        """
+
+    @abstractmethod
+    async def clear_chat_history(self, session_id: str) -> None:
+        """Delete a session's chat history."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release the store's connections."""
+
+    async def update_analysis_job(
+        self,
+        analysis_id: str,
+        status: Optional[AnalysisStatus] = None,
+        progress: Optional[float] = None,
+        current_step: Optional[str] = None,
+        results: Optional[dict] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Update analysis job status (called by analyzer service)."""
+        fields: dict[str, Any] = {}
+        if status is not None:
+            fields["status"] = status
+        if progress is not None:
+            fields["progress"] = progress
+        if current_step is not None:
+            fields["current_step"] = current_step
+        if results is not None:
+            fields["results"] = results
+        if error is not None:
+            fields["error"] = error
+        if status == AnalysisStatus.COMPLETED:
+            fields["completed_at"] = utc_now()
+        if fields:
+            await self.update_job(analysis_id, fields)
+
+
+class InMemoryJobStore(BaseJobStore):
+    """Process-local job store (state is lost on restart)."""
+
+    def __init__(self):
+        # Bounded like the Redis backend: entries expire after the session
+        # TTL, and the least recently used are evicted at capacity
+        ttl = settings.session_ttl_hours * 3600
+        self.jobs: TTLCache[str, AnalysisJob] = TTLCache(settings.max_jobs, ttl)
+        self.chat_histories: TTLCache[str, list[dict]] = TTLCache(
+            settings.max_chat_sessions, ttl
+        )
+        self._event_subscribers: dict[str, set[asyncio.Queue]] = {}
+        # session_id -> most recent analysis with results
+        self.session_analyses: TTLCache[str, str] = TTLCache(settings.max_jobs, ttl)
+        # analysis_id -> rendered chat context for its results
+        self.analysis_contexts: TTLCache[str, str] = TTLCache(settings.max_jobs, ttl)
+        # (analysis_id, format) -> encoded export of its results
+        self.exports: LRUCache[tuple[str, str], bytes] = LRUCache(
+            EXPORT_CACHE_MAX_ENTRIES
+        )
+
+    async def create_job(self, analysis_id: str, job: AnalysisJob) -> None:
+        self.jobs[analysis_id] = job
+
+    async def get_job(
+        self, analysis_id: str, include_results: bool = True
+    ) -> Optional[AnalysisJob]:
+        return self.jobs.get(analysis_id)
+
+    async def get_job_status(self, analysis_id: str) -> Optional[dict]:
+        job = self.jobs.get(analysis_id)
+        if job is None:
+            return None
+        return {name: getattr(job, name) for name in STATUS_FIELDS}
+
+    async def update_job(self, analysis_id: str, fields: dict) -> None:
+        job = self.jobs.get(analysis_id)
+        if job is None:
+            return
+        for name, value in fields.items():
+            setattr(job, name, value)
+        if "results" in fields:
+            self.session_analyses[job.session_id] = analysis_id
+            self.analysis_contexts.pop(analysis_id, None)
+            for fmt in EXPORT_FORMATS:
+                self.exports.pop((analysis_id, fmt), None)
+
+    async def publish_event(self, analysis_id: str, payload: str) -> None:
+        for queue in self._event_subscribers.get(analysis_id, ()):
+            queue.put_nowait(payload)
+
+    @asynccontextmanager
+    async def subscribe_events(
+        self, analysis_id: str
+    ) -> AsyncIterator[AsyncIterator[str]]:
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        subscribers = self._event_subscribers.setdefault(analysis_id, set())
+        subscribers.add(queue)
+
+        async def events() -> AsyncIterator[str]:
+            while True:
+                yield await queue.get()
+
+        try:
+            yield events()
+        finally:
+            subscribers.discard(queue)
+            if not subscribers:
+                self._event_subscribers.pop(analysis_id, None)
+
+    async def get_session_analysis_id(self, session_id: str) -> Optional[str]:
+        return self.session_analyses.get(session_id)
+
+    async def get_results(self, analysis_id: str) -> Optional[dict]:
+        job = self.jobs.get(analysis_id)
+        return job.results if job else None
+
+    async def get_analysis_context(self, analysis_id: str) -> Optional[str]:
+        return self.analysis_contexts.get(analysis_id)
+
+    async def set_analysis_context(self, analysis_id: str, context: str) -> None:
+        if analysis_id in self.jobs:
+            self.analysis_contexts[analysis_id] = context
+
+    async def get_export(self, analysis_id: str, fmt: str) -> Optional[bytes]:
+        return self.exports.get((analysis_id, fmt))
+
+    async def set_export(self, analysis_id: str, fmt: str, data: bytes) -> None:
+        if analysis_id in self.jobs:
+            self.exports[(analysis_id, fmt)] = data
+
+    async def append_chat_message(self, session_id: str, message: dict) -> None:
+        history = self.chat_histories.get(session_id, [])
+        seq = history[-1]["seq"] + 1 if history else 0
+        history.append({**message, "seq": seq})
+        del history[: -settings.chat_history_max_messages]
+        # Reassign to restart the expiry clock, as Redis does on append
+        self.chat_histories[session_id] = history
+
+    async def get_chat_history(
+        self,
+        session_id: str,
+        limit: Optional[int] = None,
+        cursor: Optional[int] = None,
+    ) -> list[dict]:
+        history = self.chat_histories.get(session_id, [])
+        if cursor is not None:
+            start = _history_offset(history[0] if history else None, cursor)
+            return history[start : start + limit if limit else None]
+        return history[-limit:] if limit else list(history)
+
+    async def clear_chat_history(self, session_id: str) -> None:
+        self.chat_histories.pop(session_id, None)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisJobStore(BaseJobStore):
+    """Redis-backed job store shared across API workers."""
+
+    def __init__(self, url: str):
+        self._redis = redis.from_url(url, decode_responses=True)
+        # Separate client for binary values (encoded exports)
+        self._binary_redis = redis.from_url(url)
+        self._ttl = settings.session_ttl_hours * 3600
+
+    @staticmethod
+    def _job_key(analysis_id: str) -> str:
+        return f"job:{analysis_id}"
+
+    @staticmethod
+    def _session_analysis_key(session_id: str) -> str:
+        return f"session:{session_id}:latest_analysis"
+
+    @staticmethod
+    def _context_key(analysis_id: str) -> str:
+        return f"ctx:{analysis_id}"
+
+    @staticmethod
+    def _export_key(analysis_id: str, fmt: str) -> str:
+        return f"export:{analysis_id}:{fmt}"
+
+    @staticmethod
+    def _chat_key(session_id: str) -> str:
+        return f"chat:{session_id}"
+
+    @staticmethod
+    def _events_channel(analysis_id: str) -> str:
+        return f"progress:{analysis_id}"
+
+    async def create_job(self, analysis_id: str, job: AnalysisJob) -> None:
+        job_key = self._job_key(analysis_id)
+        mapping = {
+            name: _encode_value(name, value)
+            for name in _JOB_FIELDS
+            if (value := getattr(job, name)) is not None
+        }
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(job_key, mapping=mapping)
+            pipe.expire(job_key, self._ttl)
+            await pipe.execute()
+
+    async def get_job(
+        self, analysis_id: str, include_results: bool = True
+    ) -> Optional[AnalysisJob]:
+        job_key = self._job_key(analysis_id)
+        if include_results:
+            raw = await self._redis.hgetall(job_key)
+        else:
+            # Skip fetching and decoding the (potentially large) results
+            values = await self._redis.hmget(job_key, _METADATA_FIELDS)
+            raw = {
+                name: value
+                for name, value in zip(_METADATA_FIELDS, values)
+                if value is not None
+            }
+        if not raw:
+            return None
+        return AnalysisJob(
+            **{name: _decode_value(name, value) for name, value in raw.items()}
+        )
+
+    async def get_job_status(self, analysis_id: str) -> Optional[dict]:
+        values = await self._redis.hmget(self._job_key(analysis_id), STATUS_FIELDS)
+        if values[0] is None:
+            return None
+        return {
+            name: _decode_value(name, value) if value is not None else None
+            for name, value in zip(STATUS_FIELDS, values)
+        }
+
+    async def update_job(self, analysis_id: str, fields: dict) -> None:
+        job_key = self._job_key(analysis_id)
+        session_id = await self._redis.hget(job_key, "session_id")
+        if session_id is None:
+            return
+        mapping = {
+            name: _encode_value(name, value) for name, value in fields.items()
+        }
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(job_key, mapping=mapping)
+            if "results" in fields:
+                pipe.set(
+                    self._session_analysis_key(session_id), analysis_id, ex=self._ttl
+                )
+                pipe.delete(
+                    self._context_key(analysis_id),
+                    *(self._export_key(analysis_id, fmt) for fmt in EXPORT_FORMATS),
+                )
+            await pipe.execute()
+
+    async def publish_event(self, analysis_id: str, payload: str) -> None:
+        await self._redis.publish(self._events_channel(analysis_id), payload)
+
+    @asynccontextmanager
+    async def subscribe_events(
+        self, analysis_id: str
+    ) -> AsyncIterator[AsyncIterator[str]]:
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self._events_channel(analysis_id))
+
+        async def events() -> AsyncIterator[str]:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield message["data"]
+
+        try:
+            yield events()
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    async def get_session_analysis_id(self, session_id: str) -> Optional[str]:
+        return await self._redis.get(self._session_analysis_key(session_id))
+
+    async def get_results(self, analysis_id: str) -> Optional[dict]:
+        raw = await self._redis.hget(self._job_key(analysis_id), "results")
+        return _decode_value("results", raw) if raw else None
+
+    async def get_analysis_context(self, analysis_id: str) -> Optional[str]:
+        return await self._redis.get(self._context_key(analysis_id))
+
+    async def set_analysis_context(self, analysis_id: str, context: str) -> None:
+        await self._redis.set(self._context_key(analysis_id), context, ex=self._ttl)
+
+    async def get_export(self, analysis_id: str, fmt: str) -> Optional[bytes]:
+        return await self._binary_redis.get(self._export_key(analysis_id, fmt))
+
+    async def set_export(self, analysis_id: str, fmt: str, data: bytes) -> None:
+        await self._binary_redis.set(
+            self._export_key(analysis_id, fmt), data, ex=self._ttl
+        )
+
+    async def append_chat_message(self, session_id: str, message: dict) -> None:
+        key = self._chat_key(session_id)
+
+        async def append(pipe) -> None:
+            # WATCH makes concurrent appends retry, so seqs stay in list order
+            last = await pipe.lindex(key, -1)
+            seq = _decode_message(last).get("seq", -1) + 1 if last else 0
+            pipe.multi()
+            pipe.rpush(key, _encode_message({**message, "seq": seq}))
+            pipe.ltrim(key, -settings.chat_history_max_messages, -1)
+            pipe.expire(key, self._ttl)
+
+        await self._redis.transaction(append, key)
+
+    async def get_chat_history(
+        self,
+        session_id: str,
+        limit: Optional[int] = None,
+        cursor: Optional[int] = None,
+    ) -> list[dict]:
+        key = self._chat_key(session_id)
+        if cursor is None:
+            raw = await self._redis.lrange(key, -limit if limit else 0, -1)
+            return [_decode_message(item) for item in raw]
+
+        async def read_page(pipe) -> None:
+            # WATCH retries the read if a trim shifts the list in between
+            first = await pipe.lindex(key, 0)
+            start = _history_offset(first and _decode_message(first), cursor)
+            pipe.multi()
+            pipe.lrange(key, start, start + limit - 1 if limit else -1)
+
+        (raw,) = await self._redis.transaction(read_page, key)
+        return [_decode_message(item) for item in raw]
+
+    async def clear_chat_history(self, session_id: str) -> None:
+        await self._redis.delete(self._chat_key(session_id))
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+        await self._binary_redis.aclose()
+
+
+# Global job store instance
+job_store: BaseJobStore = (
+    RedisJobStore(settings.redis_url) if settings.redis_url else InMemoryJobStore()
+)
@@ -0,0 +1,13 @@
+"""Time helpers."""
+
+from datetime import datetime, timezone
+
+
+def utc_now() -> datetime:
+    """Get the current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
+def from_timestamp(timestamp: float) -> datetime:
+    """Convert a UNIX timestamp to a timezone-aware UTC datetime."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
@@ -0,0 +1,19 @@
+"""HTTP header helpers."""
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an If-None-Match header value against an ETag.
+
+    Uses the weak comparison RFC 9110 requires for If-None-Match: list
+    members are split on commas, a ``W/`` prefix is ignored on either side,
+    and ``*`` matches any current representation.
+    """
+    if not if_none_match:
+        return False
+    etag = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
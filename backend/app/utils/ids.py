@@ -0,0 +1,38 @@
+"""Identifier helpers."""
+
+import os
+import threading
+import time
+
+# Random bytes fetched from the OS per refill, and bytes used per ID
+_ENTROPY_BUFFER_SIZE = 4096
+_RANDOM_BYTES = 6
+
+_lock = threading.Lock()
+_buffer = b""
+_offset = 0
+
+
+def _random_bytes() -> bytes:
+    """Take random bytes from a buffer refilled from the OS when exhausted."""
+    global _buffer, _offset
+    with _lock:
+        if _offset + _RANDOM_BYTES > len(_buffer):
+            _buffer = os.urandom(_ENTROPY_BUFFER_SIZE)
+            _offset = 0
+        chunk = _buffer[_offset : _offset + _RANDOM_BYTES]
+        _offset += _RANDOM_BYTES
+    return chunk
+
+
+def new_message_id() -> str:
+    """
+    Generate a 24-character hex chat message ID.
+
+    IDs start with a millisecond timestamp (like UUIDv7), so they sort by
+    creation time to the millisecond. They are identifiers, not secrets;
+    use ``secrets`` for anything that grants access (session or analysis
+    IDs).
+    """
+    timestamp = (time.time_ns() // 1_000_000).to_bytes(6, "big")
+    return (timestamp + _random_bytes()).hex()
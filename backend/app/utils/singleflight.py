@@ -0,0 +1,45 @@
+"""Coalescing of concurrent identical work."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from cachetools import TTLCache
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time; concurrent callers share it.
+
+    With ``ttl`` set, successful results are also reused for that many
+    seconds after the call completes.
+    """
+
+    def __init__(self, ttl: float = 0, maxsize: int = 64):
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._results: TTLCache[Hashable, Any] | None = (
+            TTLCache(maxsize, ttl) if ttl else None
+        )
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        if self._results is not None and key in self._results:
+            return self._results[key]
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+
+        # Shielded so a caller disconnecting doesn't cancel the shared call
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if (
+            self._results is not None
+            and not future.cancelled()
+            and future.exception() is None
+        ):
+            self._results[key] = future.result()
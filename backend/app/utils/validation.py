@@ -0,0 +1,19 @@
+"""Input validation helpers."""
+
+import re
+
+# Session IDs are client-generated UUIDs: alphanumerics and hyphens only
+_SESSION_ID_RE = re.compile(r"[A-Za-z0-9-]{1,64}")
+
+# File IDs are server-generated URL-safe tokens
+_FILE_ID_RE = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+def is_valid_session_id(session_id: str) -> bool:
+    """Check that a session ID is safe to use in paths and storage keys."""
+    return _SESSION_ID_RE.fullmatch(session_id) is not None
+
+
+def is_valid_file_id(file_id: str) -> bool:
+    """Check that a file ID is safe to use in paths."""
+    return _FILE_ID_RE.fullmatch(file_id) is not None
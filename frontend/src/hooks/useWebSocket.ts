@@ -5,6 +5,14 @@ import type { ProgressEvent } from '@/types';
 
 const WS_BASE = process.env.NEXT_PUBLIC_WS_URL || 'ws://localhost:8000';
 
+// Events arrive as binary frames of UTF-8 JSON (text frames also accepted)
+const frameDecoder = new TextDecoder();
+
+function parseEvent(data: string | ArrayBuffer): ProgressEvent {
+  const json = typeof data === 'string' ? data : frameDecoder.decode(data);
+  return JSON.parse(json) as ProgressEvent;
+}
+
 interface UseWebSocketOptions {
   onMessage?: (event: ProgressEvent) => void;
   onConnect?: () => void;
@@ -41,6 +49,7 @@ export function useAnalysisWebSocket(
 
     try {
       const ws = new WebSocket(`${WS_BASE}/ws/analysis/${sessionId}`);
+      ws.binaryType = 'arraybuffer';
 
       ws.onopen = () => {
         setIsConnected(true);
@@ -50,7 +59,7 @@ export function useAnalysisWebSocket(
 
       ws.onmessage = (event) => {
         try {
-          const data = JSON.parse(event.data) as ProgressEvent;
+          const data = parseEvent(event.data);
           onMessage?.(data);
         } catch (err) {
           console.error('Failed to parse WebSocket message:', err);
@@ -154,6 +163,7 @@ export function useChatWebSocket(
 
     try {
       const ws = new WebSocket(`${WS_BASE}/ws/chat/${sessionId}`);
+      ws.binaryType = 'arraybuffer';
 
       ws.onopen = () => {
         setIsConnected(true);
@@ -163,7 +173,7 @@ export function useChatWebSocket(
 
       ws.onmessage = (event) => {
         try {
-          const data = JSON.parse(event.data) as ProgressEvent;
+          const data = parseEvent(event.data);
 
           if (data.event_type === 'chat_typing') {
             setIsTyping(data.data?.is_typing as boolean);
@@ -147,7 +147,7 @@ export const api = {
 
   // Export
   getExportJsonUrl(analysisId: string) {
-    return `${API_BASE}/api/v1/export/json/${analysisId}`;
+    return `${API_BASE}/api/v1/export/json/${analysisId}?pretty=1`;
   },
 
   getExportPdfUrl(analysisId: string) {